@@ -18,18 +18,19 @@
 #
 # You should have received a copy of the GNU General Public License
 
-__all__ = ["OcpsCsc", "run_ocps", "CONFIG_SCHEMA"]
+__all__ = ["OcpsCsc", "OcpsConfig", "run_ocps", "CONFIG_SCHEMA"]
 
 import asyncio
-import json
+import dataclasses
 import logging
 import os
 import random
+import time
 import types
-from typing import Optional, Set
+from typing import Any, Dict, Optional, Tuple
 
-import redis
-import requests  # type: ignore
+import aiohttp
+import orjson
 import yaml
 from lsst.ts import salobj
 from lsst.ts.idl.enums.OCPS import SalIndex
@@ -37,8 +38,12 @@ from lsst.ts.utils import current_tai
 
 from . import __version__
 
-CONFIG_SCHEMA = yaml.safe_load(
-    """
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+_SCHEMA_TEXT = """
 $schema: http://json-schema.org/draft-07/schema#
 $id: https://github.com/lsst/dm_OCPS/blob/main/schema/OCPS.yaml
 # title must end with one or more spaces followed by the schema version, which must begin with "v"
@@ -70,6 +75,19 @@ properties:
           description: Time between polls for status of executing pipelines (sec)
           type: number
           exclusiveMinimum: 0
+        long_poll_wait:
+          description: >
+            If set, wait for executing pipelines to change phase using UWS
+            blocking requests that the execution service holds for up to
+            this long (sec), instead of polling (optional)
+          type: integer
+          minimum: 1
+        poll_interval_max:
+          description: >
+            Maximum time between polls for status of a pipeline whose phase
+            is unchanged (sec); defaults to four times poll_interval (optional)
+          type: number
+          exclusiveMinimum: 0
         butler:
           description: Path/URI of Butler repo
           type: string
@@ -79,6 +97,29 @@ properties:
         output_glob:
           description: Glob pattern for output dataset types
           type: string
+        http:
+          description: >
+            Tuning of the HTTP connection pool used to talk to the execution
+            service (optional). Omitted values use built-in defaults.
+          type: object
+          properties:
+            limit:
+              description: Maximum number of simultaneous connections (0 for no limit)
+              type: integer
+              minimum: 0
+            limit_per_host:
+              description: Maximum number of simultaneous connections per host (0 for no limit)
+              type: integer
+              minimum: 0
+            keepalive_timeout:
+              description: Time to keep idle connections open for reuse (sec)
+              type: number
+              exclusiveMinimum: 0
+            sock_read_timeout:
+              description: Maximum time to wait for data from the execution service (sec)
+              type: number
+              exclusiveMinimum: 0
+          additionalProperties: false
       required:
         - sal_index
         - instance
@@ -91,9 +132,65 @@ required:
   - instances
 additionalProperties: false
 """
+CONFIG_SCHEMA = yaml.load(_SCHEMA_TEXT, Loader=_Loader)
+
+DONE_PHASES = frozenset(("completed", "error", "aborted", "unknown"))
+
+# Shared by all CSC instances; Logger.addHandler ignores a handler that is
+# already attached, so creating several CSCs does not duplicate output.
+_STREAM_HANDLER = logging.StreamHandler()
+
+# Defaults for the optional ``http`` configuration of the connection pool.
+_HTTP_DEFAULTS = dict(
+    limit=64,
+    limit_per_host=32,
+    keepalive_timeout=300,
+    sock_read_timeout=60,
 )
 
-DONE_PHASES = ["completed", "error", "aborted", "unknown"]
+# Retry policy for requests to the execution service. Responses with these
+# (gateway) status codes are retried for idempotent methods only, because
+# repeating a job submission could run the pipeline twice.
+_HTTP_RETRIES = 5
+_HTTP_RETRY_BACKOFF = 0.2  # sec; doubled on each retry
+_HTTP_RETRY_STATUSES = frozenset((502, 503, 504))
+_HTTP_RETRY_METHODS = frozenset(("GET", "DELETE"))
+
+# Number of consecutive UWS blocking requests for a job that may return early
+# with the phase unchanged before the job falls back to regular polling.
+_LONG_POLL_MAX_MISSES = 3
+
+# Fields of the job submission payload that are the same for every job.
+_JOB_PAYLOAD_TEMPLATE = dict(
+    command="cd $JOB_SOURCE_DIR && bash bin/pipetask.sh",
+    url="https://github.com/lsst-dm/uws_scripts",
+    commit_ref="main",
+)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Results reported for the simulated true.yaml and false.yaml pipelines.
+_SIMULATED_TRUE_RESULT = orjson.dumps({"result": True}).decode()
+_SIMULATED_FALSE_RESULT = orjson.dumps({"result": False}).decode()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OcpsConfig:
+    """Configuration of one OCPS instance.
+
+    The fields are those of an item of ``instances`` in `CONFIG_SCHEMA`;
+    see the schema for descriptions.
+    """
+
+    sal_index: int
+    instance: str
+    url: str
+    poll_interval: float
+    butler: str
+    output_glob: str
+    input_collection: Optional[str] = None
+    poll_interval_max: Optional[float] = None
+    long_poll_wait: Optional[int] = None
+    http: Optional[dict] = None
 
 
 class OcpsCsc(salobj.ConfigurableCsc):
@@ -145,8 +242,26 @@ class OcpsCsc(salobj.ConfigurableCsc):
         override: str = "",
         simulation_mode: int = 0,
     ):
-        self.config: Optional[types.SimpleNamespace] = None
-        self.simulated_jobs: Set[str] = set()
+        self.config: Optional[OcpsConfig] = None
+        # Pipeline name of each pending simulated job, by job id.
+        self.simulated_jobs: Dict[str, str] = dict()
+        self.connection: Optional[aiohttp.ClientSession] = None
+        # Connection pool settings self.connection was created with.
+        self._http_settings: Optional[dict] = None
+        # Sessions replaced by configure while jobs were executing; closed
+        # when no job is executing.
+        self._retired_connections: list[aiohttp.ClientSession] = []
+        self._jobs_in_progress = 0
+        # ETag and decoded status of each unfinished job, by status URL.
+        self._job_status_cache: Dict[str, Tuple[str, dict]] = dict()
+        # Derived from self.config in configure.
+        self._run_options_prefix = ""
+        self._butler_repo_env: dict = dict()
+        self._output_glob_env: dict = dict()
+        self._job_url = ""
+        self._poll_interval_max = 0.0
+        # Cleared if the execution service does not support blocking polls.
+        self._long_poll_wait: Optional[int] = None
         super().__init__(
             "OCPS",
             index=index,
@@ -157,7 +272,11 @@ class OcpsCsc(salobj.ConfigurableCsc):
             simulation_mode=simulation_mode,
         )
         self.cmd_execute.allow_multiple_callbacks = True
-        self.log.addHandler(logging.StreamHandler())
+        # Optional execute fields depend on the XML version; check them once.
+        execute_data = self.cmd_execute.DataType()
+        self._has_prereq_jobs = hasattr(execute_data, "prereq_jobs")
+        self._has_output_dataset_types = hasattr(execute_data, "output_dataset_types")
+        self.log.addHandler(_STREAM_HANDLER)
 
         self.redis = None
 
@@ -171,11 +290,17 @@ class OcpsCsc(salobj.ConfigurableCsc):
         """
         self.assert_enabled("execute")
         if self.salinfo.index not in self.rapid_analysis_backend_indices:
-            self.log.info(f"execute command with {data}")
-            await self._execute(data)
+            self.log.info("execute command with %s", data)
+            self._jobs_in_progress += 1
+            try:
+                await self._execute(data)
+            finally:
+                self._jobs_in_progress -= 1
+                if self._jobs_in_progress == 0:
+                    await self._close_retired_connections()
         else:
             self.log.info(
-                f"executing command with {data} using rapid analysis backend."
+                "executing command with %s using rapid analysis backend.", data
             )
             await self._execute_with_rapid_analysis_backend(data)
 
@@ -206,107 +331,183 @@ class OcpsCsc(salobj.ConfigurableCsc):
             raise salobj.ExpectedError("Configuration not set")
         if self.simulation_mode == 0:
             # Real command.
-            if hasattr(data, "prereq_jobs") and data.prereq_jobs:
+            if self._has_prereq_jobs and data.prereq_jobs:
                 await self._wait_for_prereqs(data.prereq_jobs.split(","))
 
-            run_options = ""
-            if hasattr(self.config, "input_collection"):
-                run_options = f"-i {self.config.input_collection}"
-            payload_env = dict(
-                IMAGE_TAG=data.version,
-                PIPELINE_URL=data.pipeline,
-                BUTLER_REPO=self.config.butler,
-                RUN_OPTIONS=" ".join((run_options, data.config)),
-                OUTPUT_GLOB=self.config.output_glob,
-                DATA_QUERY=data.data_query,
-            )
-            if hasattr(data, "output_dataset_types") and data.output_dataset_types:
-                payload_env["OUTPUT_GLOB"] = data.output_dataset_types
+            # The configuration-derived entries are shared between payloads;
+            # they are only serialized, never modified.
+            output_glob_env = self._output_glob_env
+            if self._has_output_dataset_types and data.output_dataset_types:
+                output_glob_env = dict(
+                    name="OUTPUT_GLOB", value=data.output_dataset_types
+                )
+            environment = [
+                dict(name="IMAGE_TAG", value=data.version),
+                dict(name="PIPELINE_URL", value=data.pipeline),
+                self._butler_repo_env,
+                dict(
+                    name="RUN_OPTIONS",
+                    value=f"{self._run_options_prefix} {data.config}",
+                ),
+                output_glob_env,
+                dict(name="DATA_QUERY", value=data.data_query),
+            ]
 
             run_id = str(data.private_seqNum)
             json_payload = dict(
-                run_id=run_id,
-                command="cd $JOB_SOURCE_DIR && bash bin/pipetask.sh",
-                url="https://github.com/lsst-dm/uws_scripts",
-                commit_ref="main",
-                environment=[dict(name=k, value=v) for k, v in payload_env.items()],
+                run_id=run_id, **_JOB_PAYLOAD_TEMPLATE, environment=environment
+            )
+            self.log.info("PUT %s: %s", self._job_url, json_payload)
+            result = await self._request(
+                "PUT",
+                self._job_url,
+                data=orjson.dumps(json_payload),
+                headers=_JSON_HEADERS,
             )
-            self.log.info(f"PUT {self.config.url}/job: {json_payload}")
-            result = self.connection.put(f"{self.config.url}/job", json=json_payload)
             result.raise_for_status()
-            self.log.info(f"PUT {result.status_code} result: {result.text}")
-            response = result.json()
+            # The execution service always answers in UTF-8 JSON; decoding
+            # the body directly skips aiohttp's charset detection.
+            put_result_text = (await result.read()).decode()
+            self.log.info("PUT %s result: %s", result.status, put_result_text)
+            response = orjson.loads(put_result_text)
             job_id = response["jobId"]
         else:
             # Simulation mode.
             # Rather than prepare a PUT request, simulate one with a special
             # URL scheme.
-            if data.pipeline not in ("true.yaml", "false.yaml", "fault.yaml"):
-                raise salobj.ExpectedError(
-                    f"Unknown (simulated) pipeline: {data.pipeline}"
-                )
-            job_id = f"{data.pipeline}-{current_tai()}"
-            self.log.info(f"Simulated PUT result: {job_id}")
-            self.simulated_jobs.add(job_id)
-
-        payload = json.dumps(dict(job_id=job_id))
+            pipeline = data.pipeline
+            if pipeline not in self._simulated_pipelines:
+                raise salobj.ExpectedError(f"Unknown (simulated) pipeline: {pipeline}")
+            job_id = f"{pipeline}-{current_tai()}"
+            self.log.info("Simulated PUT result: %s", job_id)
+            self.simulated_jobs[job_id] = pipeline
+
+        payload = orjson.dumps({"job_id": job_id}).decode()
         # TODO DM-30032: change to a custom event
         await self.cmd_execute.ack_in_progress(data, timeout=600.0, result=payload)
-        self.log.info(f"Ack in progress: {payload}")
-        self.log.info(f"Starting async wait: {job_id}")
+        self.log.info("Ack in progress: %s", payload)
+        self.log.info("Starting async wait: %s", job_id)
 
-        while True:
-            if self.simulation_mode != 0:
-                # Simulation mode.
-                # Rather than poll for pipeline status, simulate an appropriate
-                # response.
-                await asyncio.sleep(abs(random.normalvariate(10, 4)))
-                self.log.info(f"Simulating result for {job_id}")
-                if job_id not in self.simulated_jobs:
-                    raise salobj.ExpectedError(f"No such job id: {job_id}")
-                self.simulated_jobs.remove(job_id)
-                if job_id.startswith("true.yaml-"):
-                    payload = json.dumps(dict(result=True))
-                    await self.evt_job_result.set_write(
-                        job_id=job_id, exit_code=0, result=payload
+        status_url = f"{self._job_url}/{job_id}"
+        phase = None
+        delay = 0.0
+        long_poll_misses = 0
+        try:
+            while True:
+                if self.simulation_mode != 0:
+                    # Simulation mode.
+                    # Rather than poll for pipeline status, simulate an appropriate
+                    # response.
+                    await asyncio.sleep(abs(random.gauss(10, 4)))
+                    self.log.info("Simulating result for %s", job_id)
+                    pipeline = self.simulated_jobs.pop(job_id, None)
+                    if pipeline is None:
+                        raise salobj.ExpectedError(f"No such job id: {job_id}")
+                    await self._simulated_pipelines[pipeline](self, job_id)
+                    return
+
+                long_polling = (
+                    self._long_poll_wait is not None
+                    and long_poll_misses < _LONG_POLL_MAX_MISSES
+                )
+                if long_polling and phase is not None:
+                    response, waited = await self._get_status_long(status_url, phase)
+                    if waited:
+                        long_poll_misses = 0
+                    else:
+                        long_poll_misses += 1
+                        if long_poll_misses == _LONG_POLL_MAX_MISSES:
+                            self.log.warning(
+                                "Blocking status requests for %s are not honored; "
+                                "polling instead",
+                                job_id,
+                            )
+                else:
+                    response = await self._get_status(status_url)
+                if response["jobId"] != job_id:
+                    raise salobj.ExpectedError(
+                        f"Job ID mismatch: got {response['jobId']} instead of {job_id}"
                     )
-                elif job_id.startswith("false.yaml-"):
-                    payload = json.dumps(dict(result=False))
-                    await self.evt_job_result.set_write(
-                        job_id=job_id, exit_code=0, result=payload
+                if response["runId"] != run_id:
+                    raise salobj.ExpectedError(
+                        f"Run ID mismatch: got {response['runId']} instead of {run_id}"
                     )
-                elif job_id.startswith("fault.yaml-"):
-                    await self.fault(
-                        code=2, report="404 Simulation cannot contact execution service"
+                if response["phase"] in DONE_PHASES:
+                    exit_code = 1 if response["phase"] != "completed" else 0
+                    await self.evt_job_result.set_write(
+                        job_id=job_id, exit_code=exit_code, result=put_result_text
                     )
-                    raise salobj.ExpectedError("Failed to connect (simulated)")
+                    return
                 else:
-                    raise salobj.ExpectedError(
-                        f"Unknown (simulated) pipeline: {job_id}"
+                    phase_changed = response["phase"] != phase
+                    phase = response["phase"]
+                    if (
+                        self._long_poll_wait is not None
+                        and long_poll_misses < _LONG_POLL_MAX_MISSES
+                    ):
+                        # Re-issue the blocking request straight away.
+                        continue
+                    # delay is still 0 if long polling was just given up;
+                    # start backing off as if the phase had changed.
+                    delay = self._next_poll_delay(delay, phase_changed or delay == 0)
+                    sleep_time = delay * random.uniform(0.8, 1.2)
+                    self.log.debug(
+                        "%s phase %s sleeping for %s", job_id, phase, sleep_time
                     )
-                return
+                    await asyncio.sleep(sleep_time)
+        finally:
+            self._job_status_cache.pop(status_url, None)
 
-            response = await self.get_job_status(job_id)
-            if response["jobId"] != job_id:
-                raise salobj.ExpectedError(
-                    f"Job ID mismatch: got {response['jobId']} instead of {job_id}"
-                )
-            if response["runId"] != run_id:
-                raise salobj.ExpectedError(
-                    f"Run ID mismatch: got {response['runId']} instead of {run_id}"
-                )
-            if response["phase"] in DONE_PHASES:
-                exit_code = 1 if response["phase"] != "completed" else 0
-                await self.evt_job_result.set_write(
-                    job_id=job_id, exit_code=exit_code, result=result.text
-                )
-                return
-            else:
-                self.log.debug(
-                    f"{job_id} phase {response['phase']}"
-                    f" sleeping for {self.config.poll_interval}"
-                )
-                await asyncio.sleep(self.config.poll_interval)
+    def _next_poll_delay(self, delay: float, phase_changed: bool) -> float:
+        """Return the nominal delay before the next status poll of a job.
+
+        Polling restarts at a quarter of ``poll_interval`` after each phase
+        change and backs off exponentially, up to ``poll_interval_max``, while
+        the phase is unchanged. Callers should add jitter before sleeping.
+
+        Parameters
+        ----------
+        delay: `float`
+            The previous nominal delay (sec); ignored if ``phase_changed``.
+        phase_changed: `bool`
+            Did the job phase change since the previous poll?
+
+        Returns
+        -------
+        delay: `float`
+            The new nominal delay (sec).
+        """
+        if phase_changed:
+            delay = self.config.poll_interval / 4
+        else:
+            delay *= 2
+        return min(delay, self._poll_interval_max)
+
+    async def _simulate_true(self, job_id: str) -> None:
+        """Report the result of a simulated true.yaml job."""
+        await self.evt_job_result.set_write(
+            job_id=job_id, exit_code=0, result=_SIMULATED_TRUE_RESULT
+        )
+
+    async def _simulate_false(self, job_id: str) -> None:
+        """Report the result of a simulated false.yaml job."""
+        await self.evt_job_result.set_write(
+            job_id=job_id, exit_code=0, result=_SIMULATED_FALSE_RESULT
+        )
+
+    async def _simulate_fault(self, job_id: str) -> None:
+        """Go to fault for a simulated fault.yaml job."""
+        await self.fault(
+            code=2, report="404 Simulation cannot contact execution service"
+        )
+        raise salobj.ExpectedError("Failed to connect (simulated)")
+
+    # Handler for the result of each supported simulated pipeline.
+    _simulated_pipelines = {
+        "true.yaml": _simulate_true,
+        "false.yaml": _simulate_false,
+        "fault.yaml": _simulate_fault,
+    }
 
     async def _execute_with_rapid_analysis_backend(
         self, data: types.SimpleNamespace
@@ -324,8 +525,8 @@ class OcpsCsc(salobj.ConfigurableCsc):
             Must be a json string with a key, value data to be sent to
             the rapid analysis redis server.
         """
-        self.log.debug(f"Parsing {data.config}.")
-        values = json.loads(data.config)
+        self.log.debug("Parsing %s.", data.config)
+        values = orjson.loads(data.config)
         for key, value in values.items():
             self.redis.lpush(key, value)
 
@@ -344,23 +545,191 @@ class OcpsCsc(salobj.ConfigurableCsc):
 
         Raises
         ------
-        requests.exceptions.HTTPError
+        aiohttp.ClientResponseError
             On any failure.
         """
         if self.config is None:
             raise salobj.ExpectedError("Configuration not set")
-        status_url = f"{self.config.url}/job/{job_id}"
-        self.log.info(f"GET: {status_url}")
-        result = self.connection.get(status_url)
+        return await self._get_status(f"{self._job_url}/{job_id}")
+
+    async def _get_status(self, status_url: str) -> dict:
+        """Retrieve the status of a job from its status URL.
+
+        Parameters
+        ----------
+        status_url: str
+            The status URL of the job.
+
+        Returns
+        -------
+        response: `dict`-like
+            The status response, decoded from JSON.
+
+        Raises
+        ------
+        aiohttp.ClientResponseError
+            On any failure.
+
+        Notes
+        -----
+        If the server supplied an ETag for an earlier status of an unfinished
+        job, the request is made conditional on it and a 304 (Not Modified)
+        reply returns the previously decoded status.
+        """
+        self.log.info("GET: %s", status_url)
+        cached = self._job_status_cache.get(status_url)
+        headers = {"If-None-Match": cached[0]} if cached is not None else None
+        result = await self._request("GET", status_url, headers=headers)
+        if result.status == 304 and cached is not None:
+            self.log.info("%s result not modified", status_url)
+            return cached[1]
         result.raise_for_status()
-        self.log.info(f"{status_url} result: {result.text}")
-        response = result.json()
+        result_text = (await result.read()).decode()
+        etag = result.headers.get("ETag")
+        self.log.info("%s result: %s", status_url, result_text)
+        response = orjson.loads(result_text)
+        if etag is not None and response.get("phase") not in DONE_PHASES:
+            self._job_status_cache[status_url] = (etag, response)
+        else:
+            self._job_status_cache.pop(status_url, None)
         return response
 
+    async def _get_status_long(self, status_url: str, phase: str) -> Tuple[dict, bool]:
+        """Wait for the phase of a job to change.
+
+        Issue a UWS blocking request, which the server holds for up to
+        ``long_poll_wait`` seconds or until the job leaves ``phase``.
+
+        Parameters
+        ----------
+        status_url: str
+            The status URL of the job.
+        phase: str
+            The last phase seen for the job.
+
+        Returns
+        -------
+        response: `dict`-like
+            The status response, decoded from JSON.
+        waited: `bool`
+            True if the server honored the request: the phase changed, or
+            the request was held for at least half of ``long_poll_wait``.
+
+        Raises
+        ------
+        aiohttp.ClientResponseError
+            On any failure other than 501 (Not Implemented) and gateway
+            errors.
+
+        Notes
+        -----
+        The blocking request is not retried. If it times out, the connection
+        is dropped (e.g. by a proxy), or a gateway answers 502, 503 or 504,
+        the status is fetched with a regular request instead. If the server
+        rejects blocking requests with 501 (Not Implemented), long polling is
+        disabled for this CSC and the status is fetched the same way.
+        """
+        wait = self._long_poll_wait
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=wait + 10)
+        self.log.info("GET: %s wait=%s", status_url, wait)
+        start_time = time.monotonic()
+        try:
+            result = await self._request(
+                "GET",
+                status_url,
+                params=dict(wait=wait),
+                timeout=timeout,
+                retry=False,
+            )
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            reason = repr(e)
+        else:
+            if result.status == 501:
+                self.log.warning(
+                    "Blocking status requests are not supported; polling instead"
+                )
+                self._long_poll_wait = None
+                return await self._get_status(status_url), False
+            if result.status in _HTTP_RETRY_STATUSES:
+                reason = f"status {result.status}"
+            else:
+                result.raise_for_status()
+                result_text = (await result.read()).decode()
+                self.log.info("%s result: %s", status_url, result_text)
+                response = orjson.loads(result_text)
+                waited = (
+                    response["phase"] != phase
+                    or time.monotonic() - start_time >= wait / 2
+                )
+                return response, waited
+        waited = time.monotonic() - start_time >= wait / 2
+        self.log.warning(
+            "Blocking status request for %s failed (%s); polling once",
+            status_url,
+            reason,
+        )
+        return await self._get_status(status_url), waited
+
+    async def _request(
+        self, method: str, url: str, retry: bool = True, **kwargs: Any
+    ) -> aiohttp.ClientResponse:
+        """Make a request to the execution service, retrying transient
+        failures.
+
+        Failures to connect are retried for any method; 502, 503 and 504
+        responses are retried for GET and DELETE only. Retries back off
+        exponentially. Timeouts are not retried.
+
+        Parameters
+        ----------
+        method: `str`
+            HTTP method.
+        url: `str`
+            Request URL.
+        retry: `bool`
+            Retry transient failures? If false, make a single attempt.
+        **kwargs
+            Additional arguments for `aiohttp.ClientSession.request`.
+
+        Returns
+        -------
+        result: `aiohttp.ClientResponse`
+            The final response, with its body already read and the
+            connection released.
+        """
+        attempt = 0
+        while True:
+            last_attempt = not retry or attempt == _HTTP_RETRIES
+            try:
+                result = await self.connection.request(method, url, **kwargs)
+                # Reading the whole body releases the connection to the pool
+                # and keeps the body for the caller; reading a response after
+                # leaving its context manager raises instead.
+                await result.read()
+            except aiohttp.ClientConnectorError as e:
+                if last_attempt:
+                    raise
+                reason = str(e)
+            else:
+                if (
+                    last_attempt
+                    or result.status not in _HTTP_RETRY_STATUSES
+                    or method not in _HTTP_RETRY_METHODS
+                ):
+                    return result
+                reason = f"status {result.status}"
+            delay = _HTTP_RETRY_BACKOFF * 2**attempt
+            self.log.warning(
+                "%s %s failed (%s); retrying in %s sec", method, url, reason, delay
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
     async def _wait_for_prereqs(self, jobs_list: list[str]) -> None:
         """Wait for completion of a given list of prerequisite jobs.
 
         Note that completion does not require success.
+        The jobs are polled concurrently.
 
         Parameters
         ----------
@@ -369,15 +738,35 @@ class OcpsCsc(salobj.ConfigurableCsc):
         """
         if self.config is None:
             raise salobj.ExpectedError("Configuration not set")
-        for job_id in jobs_list:
+        tasks = [
+            asyncio.create_task(self._wait_for_prereq(job_id)) for job_id in jobs_list
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _wait_for_prereq(self, job_id: str) -> None:
+        """Wait for completion of one prerequisite job.
+
+        Parameters
+        ----------
+        job_id: `str`
+            The job id to wait for.
+        """
+        status_url = f"{self._job_url}/{job_id}"
+        phase = None
+        delay = 0.0
+        try:
             while True:
                 try:
-                    response = await self.get_job_status(job_id)
-                except requests.exceptions.HTTPError as e:
-                    if e.response.status_code == 404:
+                    response = await self._get_status(status_url)
+                except aiohttp.ClientResponseError as e:
+                    if e.status == 404:
                         # This job doesn't exist, stop waiting for it
-                        self.log.warn(f"Prerequisite job {job_id} does not exist")
-                        break
+                        self.log.warning("Prerequisite job %s does not exist", job_id)
+                        return
                     else:
                         raise
                 if response["jobId"] != job_id:
@@ -386,13 +775,21 @@ class OcpsCsc(salobj.ConfigurableCsc):
                     )
                 if response["phase"] in DONE_PHASES:
                     # Job is done, stop waiting for it
-                    break
+                    return
                 else:
+                    phase_changed = response["phase"] != phase
+                    phase = response["phase"]
+                    delay = self._next_poll_delay(delay, phase_changed)
+                    sleep_time = delay * random.uniform(0.8, 1.2)
                     self.log.debug(
-                        f"Prereq job {job_id} phase {response['phase']}"
-                        f" sleeping for {self.config.poll_interval}"
+                        "Prereq job %s phase %s sleeping for %s",
+                        job_id,
+                        phase,
+                        sleep_time,
                     )
-                    await asyncio.sleep(self.config.poll_interval)
+                    await asyncio.sleep(sleep_time)
+        finally:
+            self._job_status_cache.pop(status_url, None)
 
     async def do_abort_job(self, data: types.SimpleNamespace) -> None:
         """Implement the ``abort_job`` command.
@@ -405,23 +802,24 @@ class OcpsCsc(salobj.ConfigurableCsc):
         if self.config is None:
             raise salobj.ExpectedError("Configuration not set")
         self.assert_enabled("abort_job")
-        self.log.info(f"abort_job command with {data}")
+        self.log.info("abort_job command with %s", data)
         if self.simulation_mode == 0:
-            self.log.info(f"DELETE: {data.job_id}")
-            result = self.connection.delete(f"{self.config.url}/job/{data.job_id}")
+            self.log.info("DELETE: %s", data.job_id)
+            result = await self._request("DELETE", f"{self._job_url}/{data.job_id}")
             result.raise_for_status()
-            self.log.info(f"Abort result: {result.text}")
+            result_text = (await result.read()).decode()
+            self.log.info("Abort result: %s", result_text)
             await self.evt_job_result.set_write(
-                job_id=data.job_id, exit_code=255, result=result.text
+                job_id=data.job_id, exit_code=255, result=result_text
             )
         else:
-            if data.job_id in self.simulated_jobs:
-                self.simulated_jobs.remove(data.job_id)
-                payload = json.dumps(dict(abort_time=current_tai()))
+            if self.simulated_jobs.pop(data.job_id, None) is not None:
+                # A float repr is valid JSON, so skip the generic encoder.
+                payload = f'{{"abort_time": {current_tai()!r}}}'
                 await self.evt_job_result.set_write(
                     job_id=data.job_id, exit_code=255, result=payload
                 )
-                self.log.info(f"Abort result: {payload}")
+                self.log.info("Abort result: %s", payload)
             else:
                 raise salobj.ExpectedError("No such job id: {data.job_id}")
 
@@ -437,31 +835,84 @@ class OcpsCsc(salobj.ConfigurableCsc):
             self.configure_rapid_analysis_backend()
             return
 
+        index = SalIndex(self.salinfo.index)
+        instances_by_index: Dict[int, dict] = dict()
         for c in config.instances:
-            if SalIndex(c["sal_index"]) == self.salinfo.index:
-                if self.config is not None:
-                    raise salobj.ExpectedError(
-                        f"Configuration instance {self.config} already"
-                        f" exists when {c} is seen"
-                    )
-                else:
-                    self.config = types.SimpleNamespace(**c)
-        if self.config is None:
+            existing = instances_by_index.setdefault(c["sal_index"], c)
+            if existing is not c:
+                raise salobj.ExpectedError(
+                    f"Configuration instance {existing} already"
+                    f" exists when {c} is seen"
+                )
+        instance_config = instances_by_index.get(index)
+        if instance_config is None:
             raise salobj.ExpectedError(
                 f"No configuration found for {self.salinfo.index}"
             )
-        index = SalIndex(self.salinfo.index)
+        self.config = OcpsConfig(**instance_config)
         if index != SalIndex[self.config.instance]:
             raise salobj.ExpectedError(
                 f"Configuration instance '{self.config.instance}'"
                 f" does not match CSC index '{index!r}'"
             )
-        self.log.info(f"Configuring with {self.config}")
+        self.log.info("Configuring with %s", self.config)
+        self._run_options_prefix = (
+            f"-i {self.config.input_collection}"
+            if self.config.input_collection is not None
+            else ""
+        )
+        self._butler_repo_env = dict(name="BUTLER_REPO", value=self.config.butler)
+        self._output_glob_env = dict(name="OUTPUT_GLOB", value=self.config.output_glob)
+        self._job_url = f"{self.config.url}/job"
+        self._long_poll_wait = self.config.long_poll_wait
+        self._poll_interval_max = (
+            self.config.poll_interval_max
+            if self.config.poll_interval_max is not None
+            else self.config.poll_interval * 4
+        )
         if self.simulation_mode == 0:
-            self.connection = requests.Session()
+            http = dict(_HTTP_DEFAULTS, **(self.config.http or {}))
+            if self.connection is not None and not self.connection.closed:
+                if http == self._http_settings:
+                    # Keep the pooled connections open across restarts.
+                    return
+                if self._jobs_in_progress > 0:
+                    # Executing jobs may be in the middle of a request on
+                    # this session; their later requests use the new one.
+                    self._retired_connections.append(self.connection)
+                else:
+                    await self.connection.close()
+            self._http_settings = http
+            self.connection = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=http["limit"],
+                    limit_per_host=http["limit_per_host"],
+                    keepalive_timeout=http["keepalive_timeout"],
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_read=http["sock_read_timeout"]
+                ),
+            )
+
+    async def close_tasks(self) -> None:
+        await super().close_tasks()
+        await self._close_retired_connections()
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+
+    async def _close_retired_connections(self) -> None:
+        """Close the sessions that configure replaced while jobs were
+        executing.
+        """
+        while self._retired_connections:
+            await self._retired_connections.pop().close()
 
     def configure_rapid_analysis_backend(self) -> None:
         """Configure CSC to use rapid analysis backend."""
+        # Only the rapid analysis backend needs redis.
+        import redis
 
         host = os.getenv("REDIS_HOST")
         if host is None:
@@ -477,7 +928,7 @@ class OcpsCsc(salobj.ConfigurableCsc):
                 "Make sure the environment variable REDIS_PASSWORD is set."
             )
         port = os.getenv("REDIS_PORT", 6379)
-        self.log.debug(f"Configuring redis client to {host}:{port}.")
+        self.log.debug("Configuring redis client to %s:%s.", host, port)
         self.redis = redis.Redis(host=host, password=password, port=port)
         try:
             self.redis.ping()
@@ -19,24 +19,92 @@
 # You should have received a copy of the GNU General Public License
 
 import asyncio
+import functools
 import glob
-import json
 import os
 import pathlib
+import types
 import unittest
-from contextlib import contextmanager
 
-import redis
+import orjson
 import yaml
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from lsst.dm import OCPS
 from lsst.ts import salobj
 from lsst.ts.idl.enums.OCPS import SalIndex
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 STD_TIMEOUT = 2  # standard command timeout (sec)
+_IDX_LATISS = int(SalIndex.LATISS)
+_IDX_LSSTCOMCAM = int(SalIndex.LSSTComCam)
 TEST_CONFIG_DIR = pathlib.Path(__file__).parents[1].joinpath("tests", "data", "config")
+ALL_FIELDS_PATH = TEST_CONFIG_DIR / "all_fields.yaml"
+INVALID_GLOB = str(TEST_CONFIG_DIR / "invalid_*.yaml")
+
+# Names of the configuration files that the CSC must reject.
+_INVALID_CONFIGS = tuple(
+    os.path.basename(path) for path in sorted(glob.glob(INVALID_GLOB))
+) + ("no_such_file.yaml",)
+
+# Fields of the one instance in all_fields.yaml, parsed once. The mapping
+# is read-only, though nested values such as ``http`` are plain dicts.
+_ALL_FIELDS = types.MappingProxyType(
+    yaml.load(ALL_FIELDS_PATH.read_text(), Loader=_SafeLoader)["instances"][0]
+)
+
+# Environment the rapid analysis instance needs to reach redis.
+_REDIS_ENV = {"REDIS_HOST": "http://localhost", "REDIS_PASSWORD": "12345"}
+
+
+@functools.cache
+def _config_pkg_dir() -> pathlib.Path:
+    """Return the root of the dm_config_ocps package."""
+    return pathlib.Path(os.environ["DM_CONFIG_OCPS_DIR"])
+
+
+@functools.cache
+def _redis_mock() -> unittest.mock.Mock:
+    """Return a mock of `redis.Redis`, built on first use.
+
+    Importing redis and building a Mock with spec introspects the whole
+    redis.Redis API, so only do it for the tests that need it, and once.
+    """
+    import redis
+
+    return unittest.mock.Mock(spec=redis.Redis)
+
+
+def setUpModule() -> None:
+    # Use uvloop for the per-test event loops, if it is available.
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def tearDownModule() -> None:
+    asyncio.set_event_loop_policy(None)
 
 
 class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
+    # redis.lpush calls made for test_execute_rapid_analysis's config.
+    _EXPECTED_LPUSH_CALLS = (
+        unittest.mock.call("test_int", 1234),
+        unittest.mock.call("test_str", "12345"),
+    )
+
+    def patch_redis(self) -> None:
+        """Replace `redis.Redis` with a fresh mock for this test."""
+        mock = _redis_mock()
+        mock.reset_mock()
+        self.enterContext(unittest.mock.patch("redis.Redis", mock))
+
     def basic_make_csc(
         self,
         initial_state: salobj.State,
@@ -54,20 +122,99 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             index=index,
         )
 
+    async def configure_uws(self, routes: list[web.RouteDef], **kwargs: object) -> None:
+        """Serve ``routes`` from an in-process execution service and
+        configure the CSC to use it.
+
+        Parameters
+        ----------
+        routes: `list` [`aiohttp.web.RouteDef`]
+            Routes of the execution service.
+        **kwargs
+            Configuration fields to add to or override the defaults.
+        """
+        app = web.Application()
+        app.add_routes(routes)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        instance = dict(
+            sal_index=_IDX_LATISS,
+            instance="LATISS",
+            url=f"http://{server.host}:{server.port}",
+            poll_interval=0.04,
+            butler="/repo/LATISS",
+            output_glob="*_metricvalue",
+        )
+        instance.update(kwargs)
+        await self.csc.configure(types.SimpleNamespace(instances=[instance]))
+
+    def record_poll_delays(self) -> list[float]:
+        """Record the delays the CSC computes between status polls.
+
+        Returns
+        -------
+        delays: `list` [`float`]
+            The delays, appended to as they are computed.
+        """
+        delays = []
+        next_poll_delay = self.csc._next_poll_delay
+
+        def record_delay(delay: float, phase_changed: bool) -> float:
+            delay = next_poll_delay(delay, phase_changed)
+            delays.append(delay)
+            return delay
+
+        self.enterContext(
+            unittest.mock.patch.object(self.csc, "_next_poll_delay", record_delay)
+        )
+        return delays
+
+    async def execute_job(self, **kwargs: object) -> types.SimpleNamespace:
+        """Run the CSC's execute command callback directly, as if the CSC
+        were enabled.
+
+        Parameters
+        ----------
+        **kwargs
+            Fields of the execute command data to override.
+
+        Returns
+        -------
+        data: `types.SimpleNamespace`
+            The job_result event for the job.
+        """
+        data = types.SimpleNamespace(
+            version="w_2024_01",
+            pipeline="pipeline.yaml",
+            config="",
+            data_query="",
+            private_seqNum=1,
+            prereq_jobs="",
+            output_dataset_types="",
+        )
+        vars(data).update(kwargs)
+        # There is no command to acknowledge.
+        with unittest.mock.patch.object(
+            self.csc, "assert_enabled"
+        ), unittest.mock.patch.object(
+            self.csc.cmd_execute, "ack_in_progress", unittest.mock.AsyncMock()
+        ):
+            await asyncio.wait_for(self.csc.do_execute(data), timeout=STD_TIMEOUT)
+        return await self.remote.evt_job_result.next(flush=False, timeout=STD_TIMEOUT)
+
     async def test_default_config_dir(self) -> None:
         async with self.make_csc(
             initial_state=salobj.State.STANDBY,
             config_dir=None,
             simulation_mode=1,
-            index=SalIndex.LSSTComCam,
+            index=_IDX_LSSTCOMCAM,
         ):
             self.assertEqual(self.csc.summary_state, salobj.State.STANDBY)
             await self.assert_next_summary_state(salobj.State.STANDBY)
 
             desired_config_pkg_name = "dm_config_ocps"
-            desired_config_env_name = desired_config_pkg_name.upper() + "_DIR"
-            desired_config_pkg_dir = os.environ[desired_config_env_name]
-            desired_config_dir = pathlib.Path(desired_config_pkg_dir) / "OCPS/v4"
+            desired_config_dir = _config_pkg_dir() / "OCPS/v4"
             self.assertEqual(self.csc.get_config_pkg(), desired_config_pkg_name)
             self.assertEqual(self.csc.config_dir, desired_config_dir)
 
@@ -89,66 +236,79 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     ),
                 )
 
-    @unittest.mock.patch("redis.Redis", unittest.mock.Mock(spec=redis.Redis))
+    @unittest.mock.patch.dict(os.environ, _REDIS_ENV)
     async def test_rapid_analysis_instance_env_vars_set(self) -> None:
+        self.patch_redis()
         async with self.make_csc(
             initial_state=salobj.State.STANDBY,
             config_dir=None,
             simulation_mode=1,
             index=101,
         ):
-            with self.redis_env_vars():
-                await self.check_standard_state_transitions(
-                    enabled_commands=(
-                        "execute",
-                        "abort_job",
-                    ),
-                )
-                self.csc.redis.ping.assert_called()
+            await self.check_standard_state_transitions(
+                enabled_commands=(
+                    "execute",
+                    "abort_job",
+                ),
+            )
+            self.csc.redis.ping.assert_called()
 
-    @unittest.mock.patch("redis.Redis", unittest.mock.Mock(spec=redis.Redis))
+    @unittest.mock.patch.dict(os.environ, _REDIS_ENV)
     async def test_execute_rapid_analysis(self) -> None:
+        self.patch_redis()
         async with self.make_csc(
             initial_state=salobj.State.STANDBY,
             config_dir=None,
             simulation_mode=1,
             index=101,
         ):
-            with self.redis_env_vars():
-                await salobj.set_summary_state(self.remote, salobj.State.ENABLED)
+            await salobj.set_summary_state(self.remote, salobj.State.ENABLED)
 
-                value = dict(test_int=1234, test_str="12345")
-                await self.remote.cmd_execute.set_start(
-                    config=json.dumps(value),
-                    timeout=STD_TIMEOUT,
-                )
+            value = dict(test_int=1234, test_str="12345")
+            await self.remote.cmd_execute.set_start(
+                config=orjson.dumps(value).decode(),
+                timeout=STD_TIMEOUT,
+            )
 
-                expected_calls = (
-                    unittest.mock.call("test_int", 1234),
-                    unittest.mock.call("test_str", "12345"),
-                )
-                self.csc.redis.lpush.assert_has_calls(expected_calls)
+            self.assertEqual(
+                tuple(self.csc.redis.lpush.call_args_list),
+                self._EXPECTED_LPUSH_CALLS,
+            )
 
     async def test_configuration(self) -> None:
         async with self.make_csc(
             initial_state=salobj.State.STANDBY,
             config_dir=TEST_CONFIG_DIR,
             simulation_mode=1,
-            index=SalIndex.LATISS,
+            index=_IDX_LATISS,
         ):
             self.assertEqual(self.csc.summary_state, salobj.State.STANDBY)
             await self.assert_next_summary_state(salobj.State.STANDBY)
 
-            invalid_files = glob.glob(os.path.join(TEST_CONFIG_DIR, "invalid_*.yaml"))
-            bad_config_names = [os.path.basename(name) for name in invalid_files]
-            bad_config_names.append("no_such_file.yaml")
-            for bad_config_name in bad_config_names:
-                with self.subTest(bad_config_name=bad_config_name):
-                    with salobj.assertRaisesAckError():
-                        await self.remote.cmd_start.set_start(
-                            configurationOverride=bad_config_name,
-                            timeout=STD_TIMEOUT,
-                        )
+            bad_config_names = _INVALID_CONFIGS
+            # Send all the bad start commands at once; the CSC still
+            # processes them one at a time, but their round trips overlap.
+            # Allow for that queueing in the timeout.
+            results = await asyncio.gather(
+                *(
+                    self.remote.cmd_start.set_start(
+                        configurationOverride=bad_config_name,
+                        timeout=STD_TIMEOUT * len(bad_config_names),
+                    )
+                    for bad_config_name in bad_config_names
+                ),
+                return_exceptions=True,
+            )
+            # A timeout is also an AckError, but not a rejection.
+            accepted = [
+                name
+                for name, result in zip(bad_config_names, results)
+                if not (
+                    isinstance(result, salobj.AckError)
+                    and result.ackcmd.ack == salobj.SalRetCode.CMD_FAILED
+                )
+            ]
+            self.assertEqual(accepted, [])
 
             await self.remote.cmd_start.set_start(
                 configurationOverride="all_fields.yaml", timeout=STD_TIMEOUT
@@ -160,31 +320,30 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             )
             self.assertEqual(self.csc.summary_state, salobj.State.DISABLED)
             await self.assert_next_summary_state(salobj.State.DISABLED)
-            all_fields_path = os.path.join(TEST_CONFIG_DIR, "all_fields.yaml")
-            with open(all_fields_path, "r") as f:
-                all_fields_raw = f.read()
-            all_fields_data = yaml.safe_load(all_fields_raw)
-            for field, value in all_fields_data["instances"][0].items():
+            for field, value in _ALL_FIELDS.items():
                 self.assertEqual(getattr(self.csc.config, field), value)
 
     async def test_bin_script(self) -> None:
-        await self.check_bin_script(
-            name="OCPS", index=int(SalIndex.LATISS), exe_name="run_ocps"
+        # Each run pays for interpreter and DDS startup, so overlap them.
+        results = await asyncio.gather(
+            self.check_bin_script(name="OCPS", index=_IDX_LATISS, exe_name="run_ocps"),
+            self.check_bin_script(
+                name="OCPS", index=_IDX_LSSTCOMCAM, exe_name="run_ocps"
+            ),
+            self.check_bin_script(name="OCPS", index=4, exe_name="run_ocps", timeout=5),
+            return_exceptions=True,
         )
-        await self.check_bin_script(
-            name="OCPS", index=int(SalIndex.LSSTComCam), exe_name="run_ocps"
-        )
-        with self.assertRaises(asyncio.exceptions.TimeoutError):
-            await self.check_bin_script(
-                name="OCPS", index=4, exe_name="run_ocps", timeout=5
-            )
+        for result in results[:2]:
+            if isinstance(result, BaseException):
+                raise result
+        self.assertIsInstance(results[2], asyncio.exceptions.TimeoutError)
 
     async def test_standard_state_transitions(self) -> None:
         async with self.make_csc(
             initial_state=salobj.State.STANDBY,
             config_dir=None,
             simulation_mode=1,
-            index=SalIndex.LSSTComCam,
+            index=_IDX_LSSTCOMCAM,
         ):
             await self.check_standard_state_transitions(
                 enabled_commands=(
@@ -198,9 +357,10 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             initial_state=salobj.State.ENABLED,
             config_dir=None,
             simulation_mode=1,
-            index=SalIndex.LATISS,
+            index=_IDX_LATISS,
         ):
-            for pipeline, result in (("true.yaml", True), ("false.yaml", False)):
+
+            async def run_one(pipeline: str) -> str:
                 ack = await self.remote.cmd_execute.set_start(
                     pipeline=pipeline,
                     version="ignored",
@@ -208,19 +368,36 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     wait_done=False,
                 )
                 self.assertEqual(ack.ack, salobj.SalRetCode.CMD_INPROGRESS)
-                job_id = json.loads(ack.result)["job_id"]
+                job_id = orjson.loads(ack.result)["job_id"]
                 self.assertTrue(
                     job_id.startswith(pipeline), f"incorrect job_id {job_id}"
                 )
                 ack = await self.remote.cmd_execute.next_ackcmd(ack)
                 self.assertEqual(ack.ack, salobj.SalRetCode.CMD_COMPLETE)
-                data = await self.remote.evt_job_result.next(flush=False)
-                self.assertEqual(data.job_id, job_id)
-                self.assertEqual(data.exit_code, 0)
-                self.assertEqual(json.loads(data.result)["result"], result)
+                return job_id
+
+            # Run both pipelines at once; the job_result events may arrive
+            # in either order, so match them up by job_id.
+            expected_results = {"true.yaml": True, "false.yaml": False}
+            async with asyncio.TaskGroup() as tg:
+                tasks = {
+                    pipeline: tg.create_task(run_one(pipeline))
+                    for pipeline in expected_results
+                }
+            job_results = dict()
+            for _ in expected_results:
+                data = await self.remote.evt_job_result.next(
+                    flush=False, timeout=STD_TIMEOUT
+                )
+                job_results[data.job_id] = data
+            for pipeline, result in expected_results.items():
+                with self.subTest(pipeline=pipeline):
+                    data = job_results[tasks[pipeline].result()]
+                    self.assertEqual(data.exit_code, 0)
+                    self.assertEqual(orjson.loads(data.result)["result"], result)
 
             with self.assertRaises(salobj.AckError):
-                ack = await self.remote.cmd_execute.set_start(
+                await self.remote.cmd_execute.set_start(
                     pipeline="unknown$pipeline.yaml",
                     version="ignored",
                     config="ignored",
@@ -228,22 +405,419 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 )
 
             with self.assertRaises(salobj.AckError):
-                ack = await self.remote.cmd_execute.set_start(
+                await self.remote.cmd_execute.set_start(
                     pipeline="fault.yaml",
                     version="ignored",
                     config="ignored",
                     wait_done=True,
                 )
 
-    @contextmanager
-    def redis_env_vars(self):
-        try:
-            os.environ["REDIS_HOST"] = "http://localhost"
-            os.environ["REDIS_PASSWORD"] = "12345"
-            yield
-        finally:
-            del os.environ["REDIS_HOST"]
-            del os.environ["REDIS_PASSWORD"]
+    async def test_long_poll_not_implemented(self) -> None:
+        status_gets = 0
+
+        async def put_job(request: web.Request) -> web.Response:
+            return web.json_response(dict(jobId="j1"))
+
+        async def get_status(request: web.Request) -> web.Response:
+            nonlocal status_gets
+            if "wait" in request.query:
+                return web.Response(status=501)
+            status_gets += 1
+            phase = "executing" if status_gets < 5 else "completed"
+            return web.json_response(dict(jobId="j1", runId="1", phase=phase))
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws(
+                [web.put("/job", put_job), web.get("/job/j1", get_status)],
+                long_poll_wait=10,
+            )
+            delays = self.record_poll_delays()
+            data = await self.execute_job()
+
+            # After the 501 the CSC polls, backing off from poll_interval/4.
+            self.assertIsNone(self.csc._long_poll_wait)
+            self.assertEqual(status_gets, 5)
+            self.assertEqual(delays, [0.01, 0.02, 0.04])
+            self.assertEqual(data.job_id, "j1")
+            self.assertEqual(data.exit_code, 0)
+            self.assertEqual(self.csc._job_status_cache, dict())
+
+    async def test_long_poll_phase_change(self) -> None:
+        wait_gets = 0
+
+        async def put_job(request: web.Request) -> web.Response:
+            return web.json_response(dict(jobId="j1"))
+
+        async def get_status(request: web.Request) -> web.Response:
+            nonlocal wait_gets
+            phase = "executing"
+            if "wait" in request.query:
+                wait_gets += 1
+                # Hold the request until the job finishes.
+                await asyncio.sleep(0.2)
+                phase = "completed"
+            return web.json_response(dict(jobId="j1", runId="1", phase=phase))
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws(
+                [web.put("/job", put_job), web.get("/job/j1", get_status)],
+                long_poll_wait=1,
+            )
+            delays = self.record_poll_delays()
+            data = await self.execute_job()
+
+            self.assertEqual(wait_gets, 1)
+            self.assertEqual(delays, [])
+            self.assertEqual(self.csc._long_poll_wait, 1)
+            self.assertEqual(data.exit_code, 0)
+
+    async def test_long_poll_not_honored(self) -> None:
+        status_gets = 0
+        wait_gets = 0
+
+        async def put_job(request: web.Request) -> web.Response:
+            return web.json_response(dict(jobId="j1"))
+
+        async def get_status(request: web.Request) -> web.Response:
+            nonlocal status_gets, wait_gets
+            phase = "executing"
+            if "wait" in request.query:
+                # Answer at once, without waiting for a phase change.
+                wait_gets += 1
+            else:
+                status_gets += 1
+                if status_gets == 3:
+                    phase = "completed"
+            return web.json_response(dict(jobId="j1", runId="1", phase=phase))
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws(
+                [web.put("/job", put_job), web.get("/job/j1", get_status)],
+                long_poll_wait=1,
+            )
+            delays = self.record_poll_delays()
+            data = await self.execute_job()
+
+            # This job gave up long polling after repeated early returns;
+            # other jobs still use it.
+            self.assertEqual(wait_gets, 3)
+            self.assertEqual(delays, [0.01, 0.02])
+            self.assertEqual(self.csc._long_poll_wait, 1)
+            self.assertEqual(data.exit_code, 0)
+
+    async def test_long_poll_gateway_error(self) -> None:
+        requests = []
+
+        async def put_job(request: web.Request) -> web.Response:
+            return web.json_response(dict(jobId="j1"))
+
+        async def get_status(request: web.Request) -> web.Response:
+            if "wait" in request.query:
+                requests.append("wait")
+                if requests.count("wait") == 1:
+                    return web.Response(status=504)
+                # Drop the connection, as a proxy might.
+                request.transport.close()
+                return web.Response()
+            requests.append("get")
+            phase = "executing" if requests.count("get") < 3 else "completed"
+            return web.json_response(dict(jobId="j1", runId="1", phase=phase))
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws(
+                [web.put("/job", put_job), web.get("/job/j1", get_status)],
+                long_poll_wait=1,
+            )
+            data = await self.execute_job()
+
+            # The 504 is not retried, and each failed blocking request is
+            # replaced by a regular status request. (aiohttp itself may
+            # resend a request whose reused connection was dropped.)
+            self.assertEqual(requests[:4], ["get", "wait", "get", "wait"])
+            self.assertEqual(requests[-1], "get")
+            self.assertEqual(requests.count("get"), 3)
+            self.assertEqual(self.csc._long_poll_wait, 1)
+            self.assertEqual(data.exit_code, 0)
+
+    async def test_execute_payload(self) -> None:
+        payloads = []
+
+        async def put_job(request: web.Request) -> web.Response:
+            payloads.append(await request.json())
+            return web.json_response(dict(jobId=f"j{len(payloads)}"))
+
+        async def get_status(request: web.Request) -> web.Response:
+            job_id = request.match_info["job_id"]
+            run_id = payloads[int(job_id[1:]) - 1]["run_id"]
+            return web.json_response(
+                dict(jobId=job_id, runId=run_id, phase="completed")
+            )
+
+        routes = [web.put("/job", put_job), web.get("/job/{job_id}", get_status)]
+
+        def environment(run_options: str, output_glob: str) -> list[dict]:
+            return [
+                dict(name="IMAGE_TAG", value="w_2024_01"),
+                dict(name="PIPELINE_URL", value="pipeline.yaml"),
+                dict(name="BUTLER_REPO", value="/repo/LATISS"),
+                dict(name="RUN_OPTIONS", value=run_options),
+                dict(name="OUTPUT_GLOB", value=output_glob),
+                dict(name="DATA_QUERY", value="visit=1"),
+            ]
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws(routes, input_collection="LATISS/defaults")
+            await self.execute_job(
+                config="-c a=1",
+                data_query="visit=1",
+                private_seqNum=1,
+                output_dataset_types="*_override",
+            )
+            # The override must not leak into the next job.
+            await self.execute_job(
+                config="-c a=2", data_query="visit=1", private_seqNum=2
+            )
+            await self.configure_uws(routes)
+            await self.execute_job(
+                config="-c a=3", data_query="visit=1", private_seqNum=3
+            )
+
+        common = dict(
+            command="cd $JOB_SOURCE_DIR && bash bin/pipetask.sh",
+            url="https://github.com/lsst-dm/uws_scripts",
+            commit_ref="main",
+        )
+        self.assertEqual(
+            payloads,
+            [
+                dict(
+                    run_id="1",
+                    **common,
+                    environment=environment("-i LATISS/defaults -c a=1", "*_override"),
+                ),
+                dict(
+                    run_id="2",
+                    **common,
+                    environment=environment(
+                        "-i LATISS/defaults -c a=2", "*_metricvalue"
+                    ),
+                ),
+                dict(
+                    run_id="3",
+                    **common,
+                    environment=environment(" -c a=3", "*_metricvalue"),
+                ),
+            ],
+        )
+
+    async def test_wait_for_prereqs(self) -> None:
+        late_gets = 0
+
+        async def get_status(request: web.Request) -> web.Response:
+            nonlocal late_gets
+            job_id = request.match_info["job_id"]
+            if job_id == "missing":
+                return web.Response(status=404)
+            phase = "completed"
+            if job_id == "late":
+                late_gets += 1
+                if late_gets < 3:
+                    phase = "executing"
+            return web.json_response(
+                dict(jobId=job_id, runId="1", phase=phase),
+                headers={"ETag": f'"{job_id}-{late_gets}"'},
+            )
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws([web.get("/job/{job_id}", get_status)])
+            await asyncio.wait_for(
+                self.csc._wait_for_prereqs(["missing", "late", "done"]),
+                timeout=STD_TIMEOUT,
+            )
+            self.assertEqual(late_gets, 3)
+            self.assertEqual(self.csc._job_status_cache, dict())
+
+    async def test_wait_for_prereqs_failure(self) -> None:
+        slow_gets = 0
+
+        async def get_status(request: web.Request) -> web.Response:
+            nonlocal slow_gets
+            job_id = request.match_info["job_id"]
+            if job_id == "slow":
+                slow_gets += 1
+                return web.json_response(
+                    dict(jobId=job_id, runId="1", phase="executing"),
+                    headers={"ETag": f'"{slow_gets}"'},
+                )
+            # Wait for "slow" to be polled, then report the wrong job.
+            await asyncio.sleep(0.05)
+            return web.json_response(dict(jobId="other", runId="1", phase="executing"))
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws([web.get("/job/{job_id}", get_status)])
+            with self.assertRaises(salobj.ExpectedError):
+                await asyncio.wait_for(
+                    self.csc._wait_for_prereqs(["slow", "bad"]),
+                    timeout=STD_TIMEOUT,
+                )
+            self.assertGreater(slow_gets, 0)
+
+            # The wait for "slow" was cancelled: it stops polling and drops
+            # its cached status.
+            await asyncio.sleep(0.2)
+            gets = slow_gets
+            await asyncio.sleep(0.2)
+            self.assertEqual(slow_gets, gets)
+            self.assertEqual(self.csc._job_status_cache, dict())
+
+    async def test_reconfigure_session(self) -> None:
+        requested = asyncio.Event()
+        release = asyncio.Event()
+
+        async def put_job(request: web.Request) -> web.Response:
+            return web.json_response(dict(jobId="j1"))
+
+        async def get_status(request: web.Request) -> web.Response:
+            requested.set()
+            await release.wait()
+            return web.json_response(dict(jobId="j1", runId="1", phase="completed"))
+
+        routes = [web.put("/job", put_job), web.get("/job/j1", get_status)]
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws(routes)
+            session = self.csc.connection
+            # The same http settings keep the session.
+            await self.configure_uws(routes)
+            self.assertIs(self.csc.connection, session)
+            self.assertFalse(session.closed)
+
+            # Changed settings replace it, but the old session stays open
+            # until the job polling through it finishes.
+            job_task = asyncio.create_task(self.execute_job())
+            await asyncio.wait_for(requested.wait(), timeout=STD_TIMEOUT)
+            await self.configure_uws(routes, http=dict(limit=4))
+            self.assertIsNot(self.csc.connection, session)
+            self.assertFalse(session.closed)
+            release.set()
+            data = await job_task
+            self.assertEqual(data.exit_code, 0)
+            self.assertTrue(session.closed)
+            self.assertFalse(self.csc.connection.closed)
+
+    async def test_request_retries_get(self) -> None:
+        statuses = [503, 200]
+
+        async def get_status(request: web.Request) -> web.Response:
+            return web.Response(status=statuses.pop(0))
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws([web.get("/job/j1", get_status)])
+            result = await self.csc._request("GET", f"{self.csc._job_url}/j1")
+            self.assertEqual(result.status, 200)
+            self.assertEqual(statuses, [])
+
+    async def test_request_does_not_retry_put(self) -> None:
+        puts = 0
+
+        async def put_job(request: web.Request) -> web.Response:
+            nonlocal puts
+            puts += 1
+            return web.Response(status=503)
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws([web.put("/job", put_job)])
+            result = await self.csc._request("PUT", self.csc._job_url, data=b"{}")
+            self.assertEqual(result.status, 503)
+            self.assertEqual(puts, 1)
+
+    async def test_get_status_not_modified(self) -> None:
+        etag = '"v1"'
+
+        async def get_status(request: web.Request) -> web.Response:
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304)
+            return web.json_response(
+                dict(jobId="j1", runId="1", phase="executing"),
+                headers={"ETag": etag},
+            )
+
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws([web.get("/job/j1", get_status)])
+            status_url = f"{self.csc._job_url}/j1"
+            response = await self.csc._get_status(status_url)
+            self.assertEqual(response["phase"], "executing")
+            self.assertIs(await self.csc._get_status(status_url), response)
+
+    async def test_next_poll_delay(self) -> None:
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY,
+            config_dir=TEST_CONFIG_DIR,
+            simulation_mode=0,
+            index=_IDX_LATISS,
+        ):
+            await self.configure_uws([], poll_interval=1, poll_interval_max=3)
+            delay = self.csc._next_poll_delay(10, phase_changed=True)
+            self.assertEqual(delay, 0.25)
+            delays = []
+            for _ in range(6):
+                delay = self.csc._next_poll_delay(delay, phase_changed=False)
+                delays.append(delay)
+            self.assertEqual(delays, [0.5, 1, 2, 3, 3, 3])
 
 
 if __name__ == "__main__":